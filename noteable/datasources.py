@@ -213,17 +213,25 @@ def pre_process_dict(the_dict: Dict[str, Any]) -> None:
     create_engine(), we need to finally honor the intent of those blanks
     as 'unset'.
     """
-    for k, v in list(the_dict.items()):
+    # Common case: a flat dict with nothing blank in it. Nothing to do.
+    if not any(v == '' or isinstance(v, dict) for v in the_dict.values()):
+        return
+
+    doomed_keys = []
+    for k, v in the_dict.items():
         if v == '':
-            del the_dict[k]
-        if isinstance(v, dict):
+            doomed_keys.append(k)
+        elif isinstance(v, dict):
             # connect_args dicts may not be flat. But they do end, eventually,
             # otherwise they'd not be JSON-able to make it this far.
             pre_process_dict(v)
             # That could have possibly removed *everything* from that dict. If
             # so, then remove it from our dict also.
             if len(v) == 0:
-                del the_dict[k]
+                doomed_keys.append(k)
+
+    for k in doomed_keys:
+        del the_dict[k]
 
 
 LOCAL_DB_CONN_HANDLE = "@noteable"
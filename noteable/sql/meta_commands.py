@@ -4,9 +4,11 @@ import pathlib
 import re
 import sys
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 from uuid import UUID
 
 import requests
@@ -339,35 +341,30 @@ def parse_schema_and_relation_glob(
     return (schema, table_pat)
 
 
-# Only expect simple chars in schema/table names.
-ALLOWED_CHARS_RE = re.compile(r'[a-zA-Z0-9_ ]')
+# Only expect simple chars in schema/table names, plus the glob chars.
+DISALLOWED_GLOB_CHARS_RE = re.compile(r'[^a-zA-Z0-9_ *?]')
 
 
+@lru_cache(maxsize=256)
 def convert_relation_glob_to_regex(glob: str, imply_prefix=False) -> re.Pattern:
     """Convert a simple glob like 'foo*' or 'foo_??' from glob spelling to a regex, pessimistically.
     Only allow letters, numbers, underscore, and spaces to pass through from end-user string.
 
-    If no glob chars are found (*, ?), then we interpret this as a prefix match
+    If no glob chars are found (*, ?), then we interpret this as a prefix match.
+
+    Users tend to repeat the same few globs, so the compiled patterns are cached.
     """
-    buf = []
-    found_glob_char = False
-    for char in glob:
-        if ALLOWED_CHARS_RE.match(char):
-            buf.append(char)
-        elif char == '*':
-            # Glob spelling '*' -> regex spelling '.*'
-            buf.append('.*')
-            found_glob_char = True
-        elif char == '?':
-            # Glob spelling '?' -> regex spelling '.'
-            buf.append('.')
-            found_glob_char = True
+    glob = DISALLOWED_GLOB_CHARS_RE.sub('', glob)
+    found_glob_char = '*' in glob or '?' in glob
+
+    # Glob spelling '*' -> regex spelling '.*', '?' -> '.'
+    regex = glob.replace('*', '.*').replace('?', '.')
 
     if not found_glob_char and imply_prefix:
         # Implied prefix matching only.
-        buf.append('.*')
+        regex += '.*'
 
-    return re.compile(''.join(buf))
+    return re.compile(regex)
 
 
 class SingleRelationCommand(MetaCommand):
@@ -552,17 +549,30 @@ class IntrospectAndStoreDatabaseCommand(MetaCommand):
 
             # Introspect each relation concurrently.
             # TODO: Take minimum concurrency as a param?
-            with ThreadPoolExecutor(max_workers=inspector.max_concurrency) as executor:
-                future_to_relation = {
-                    executor.submit(
-                        self.fully_introspect, inspector, schema_name, relation_name, kind
-                    ): (schema_name, relation_name, kind)
-                    for (schema_name, relation_name, kind) in relations_and_kinds
-                }
+            # Only keep a bounded window of relations submitted at once, topping it up as each
+            # is consumed, so that finished descriptions cannot pile up faster than the messenger
+            # POSTs them to gate. Peak memory then tracks this window, not the schema size.
+            max_in_flight = max(2 * RelationStructureMessager.CAPACITY, inspector.max_concurrency)
+            pending_relations = iter(relations_and_kinds)
+            in_flight: Set[Future] = set()
 
-                for future in as_completed(future_to_relation):
-                    schema_name, relation_name, kind = future_to_relation[future]
-                    messenger.queue_for_delivery(future.result())
+            with ThreadPoolExecutor(max_workers=inspector.max_concurrency) as executor:
+                while True:
+                    for schema_name, relation_name, kind in islice(
+                        pending_relations, max_in_flight - len(in_flight)
+                    ):
+                        in_flight.add(
+                            executor.submit(
+                                self.fully_introspect, inspector, schema_name, relation_name, kind
+                            )
+                        )
+
+                    if not in_flight:
+                        break
+
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        messenger.queue_for_delivery(future.result())
 
         table_introspection_delta = delta()
         print(f'Done introspecting and messaging gate in {table_introspection_delta}')
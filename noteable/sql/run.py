@@ -1,4 +1,7 @@
+from functools import lru_cache
+
 import sqlparse
+from jinja2 import Template
 from jinjasql import JinjaSql
 
 from noteable.sql.connection import ResultSet
@@ -45,6 +48,25 @@ jinja_sql = JinjaSql(param_style='numeric')
 ##
 
 
+_MAX_CACHED_STATEMENT_LENGTH = 2048
+"""Statements longer than this get parsed into a fresh Template every time, not a cached one."""
+
+
+def _template_for(statement: str) -> Template:
+    """Return the jinja Template for a SQL statement, reusing an already-parsed one when the
+    same short cell gets rerun. The cache is kept small, and long statements bypass it entirely,
+    so that it never pins many cell sources and their Templates for the kernel's lifetime."""
+    if len(statement) > _MAX_CACHED_STATEMENT_LENGTH:
+        return jinja_sql.env.from_string(statement)
+
+    return _cached_template_for(statement)
+
+
+@lru_cache(maxsize=32)
+def _cached_template_for(statement: str) -> Template:
+    return jinja_sql.env.from_string(statement)
+
+
 def run(conn, sql, config, user_namespace, skip_boxing_scalar_result: bool):
     if sql.strip():
         for statement in sqlparse.split(sql):
@@ -52,7 +74,7 @@ def run(conn, sql, config, user_namespace, skip_boxing_scalar_result: bool):
             if first_word == "begin":
                 raise Exception("ipython_sql does not support transactions")
 
-            query, bind_list = jinja_sql.prepare_query(statement, user_namespace)
+            query, bind_list = jinja_sql.prepare_query(_template_for(statement), user_namespace)
 
             # Convert bind_list from positional list to dict per needs of a paramaterized text()
             # construct.
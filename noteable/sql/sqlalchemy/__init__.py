@@ -546,6 +546,9 @@ class SnowflakeConnection(IntrospectableSQLAlchemyConnection):
 class SQLiteConnection(IntrospectableSQLAlchemyConnection):
     needs_explicit_commit = False
 
+    DOWNLOAD_CHUNK_SIZE = 1 << 20
+    """How many bytes at a time to stream a database file being downloaded to disk"""
+
     @classmethod
     def preprocess_configuration(
         cls, datasource_id: str, dsn_dict: Dict[str, Any], create_engine_kwargs: Dict[str, Any]
@@ -583,14 +586,15 @@ class SQLiteConnection(IntrospectableSQLAlchemyConnection):
                     max_download_seconds=max_download_seconds,
                 )
 
-                resp = requests.get(dsn_dict['database'], stream=True, timeout=max_download_seconds)
-
-                resp.raise_for_status()
+                with requests.get(
+                    dsn_dict['database'], stream=True, timeout=max_download_seconds
+                ) as resp:
+                    resp.raise_for_status()
 
-                # Save to a durable tmpfile
-                with NamedTemporaryFile(delete=False) as outf:
-                    for chunk in resp.iter_content(chunk_size=2048):
-                        outf.write(chunk)
+                    # Save to a durable tmpfile, never holding more than a chunk in memory.
+                    with NamedTemporaryFile(delete=False) as outf:
+                        for chunk in resp.iter_content(chunk_size=cls.DOWNLOAD_CHUNK_SIZE):
+                            outf.write(chunk)
 
                 # Point to the resulting file.
                 dsn_dict['database'] = cur_path = outf.name
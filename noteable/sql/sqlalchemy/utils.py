@@ -1,5 +1,5 @@
 from functools import lru_cache, wraps
-from typing import Any, Callable, Iterable, List, Optional, Tuple
+from typing import Any, Callable, FrozenSet, List, Optional, Tuple
 
 import structlog
 from sqlalchemy.engine import CursorResult
@@ -76,11 +76,11 @@ class WrappedInspector(InspectorProtocol):
     """
 
     max_concurrency = 10
-    schemas_to_avoid: Iterable[str]
+    schemas_to_avoid: FrozenSet[str]
 
     def __init__(self, underlying_inspector: Inspector, schemas_to_avoid=('information_schema',)):
         self.underlying_inspector = underlying_inspector
-        self.schemas_to_avoid = schemas_to_avoid
+        self.schemas_to_avoid = frozenset(schemas_to_avoid)
 
     # Direct passthrough attributes / methods
     @property
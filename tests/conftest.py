@@ -8,8 +8,9 @@ from uuid import UUID, uuid4
 import pytest
 from IPython.core.interactiveshell import InteractiveShell
 from managed_service_fixtures import CockroachDetails
-from sqlalchemy import inspect
+from sqlalchemy import event, inspect
 from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
 
 from noteable.datasources import queue_bootstrap_duckdb
 from noteable.logging import RawLogCapture, configure_logging
@@ -27,6 +28,9 @@ from noteable.sql.sqlalchemy import CockroachDBConnection, SQLiteConnection
 # managed_service_fixtures plugin for a live cockroachdb
 pytest_plugins = 'managed_service_fixtures'
 
+# tests/fixture_data/ dir
+FIXTURE_DATA: Path = Path(__file__).resolve().parent / 'fixture_data'
+
 
 @pytest.fixture(scope="session", autouse=True)
 def _configure_logging():
@@ -127,16 +131,37 @@ def with_duckdb_bootstrapped(with_empty_connections) -> None:
     yield
 
 
-@pytest.fixture
-def ipython_shell() -> InteractiveShell:
+@pytest.fixture(scope='session')
+def session_ipython_shell() -> InteractiveShell:
+    """One InteractiveShell for the whole session. They're expensive to construct."""
     return InteractiveShell()
 
 
 @pytest.fixture
-def sql_magic(ipython_shell) -> SqlMagic:
-    magic = SqlMagic(ipython_shell)
+def ipython_shell(session_ipython_shell: InteractiveShell) -> InteractiveShell:
+    """The session's InteractiveShell, with its user namespace put back the way it was
+    found after each test."""
+    user_ns = session_ipython_shell.user_ns
+    orig_user_ns = user_ns.copy()
+
+    yield session_ipython_shell
+
+    user_ns.clear()
+    user_ns.update(orig_user_ns)
+
+
+@pytest.fixture(scope='session')
+def session_sql_magic(session_ipython_shell: InteractiveShell) -> SqlMagic:
+    return SqlMagic(session_ipython_shell)
+
+
+@pytest.fixture
+def sql_magic(session_sql_magic: SqlMagic, ipython_shell: InteractiveShell) -> SqlMagic:
+    magic = session_sql_magic
     # As would be done when we normally bootstrap things ...
     magic.autopandas = True
+    magic.feedback = True
+    magic.autocommit = True
 
     return magic
 
@@ -253,15 +278,15 @@ def session_durable_registry() -> None:
 
 @pytest.fixture()
 def sqlite_database_connection(session_durable_registry) -> Tuple[str, str]:
-    """Make an @sqlite SQLite connection to simulate a non-default bootstrapped datasource.
+    """Make an empty SQLite connection to simulate a non-default bootstrapped datasource.
 
-    This is a function scoped fixture, scribbling into the session-scoped registry, because
-    the existing tests written against sqlite handle expect a new as-from populated_sqlite_database
-    db every time.
+    This is a function scoped fixture, scribbling into the session-scoped registry, so that
+    each test gets a brand new empty in-memory database. Distinct from the @sqlite
+    connection managed by populated_sqlite_database.
     """
 
-    handle = '@sqlite'
-    human_name = "My Sqlite Connection"
+    handle = '@scratch_sqlite'
+    human_name = "My Scratch Sqlite Connection"
 
     # Get rid of any previous one from prior tests....
     session_durable_registry.close_and_pop(handle)
@@ -283,19 +308,57 @@ def sqlite_database_connection(session_durable_registry) -> Tuple[str, str]:
     return handle, human_name
 
 
-@pytest.fixture
-def populated_sqlite_database(
-    session_durable_registry, sqlite_database_connection: Tuple[str, str]
-) -> None:
-    handle, _ = sqlite_database_connection
+@pytest.fixture(scope='session')
+def session_populated_sqlite_database(session_durable_registry) -> SQLiteConnection:
+    """Make and populate the @sqlite in-memory database once per session.
+
+    pysqlite does not normally include DDL in transactions, so take over transaction
+    control from it. That way populated_sqlite_database can roll back whatever each
+    test did, DDL included.
+    """
+
+    connection = SQLiteConnection(
+        '@sqlite',
+        {'name': 'My Sqlite Connection'},  # metadata dict
+        {'drivername': 'sqlite', 'database': ':memory:'},  # dsn_dict
+        # Every checkout, from any thread, gets the one in-memory database. Checkins must not
+        # roll back, else they would end populated_sqlite_database's per-test transaction.
+        # Since the one dbapi connection lives all session, give its prepared statement
+        # cache room for every distinct statement the suite runs.
+        {
+            'poolclass': StaticPool,
+            'pool_reset_on_return': None,
+            'connect_args': {'check_same_thread': False, 'cached_statements': 256},
+        },
+    )
+
+    @event.listens_for(connection.sqla_engine, 'connect')
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(connection.sqla_engine, 'begin')
+    def _emit_begin(sqla_connection):
+        sqla_connection.exec_driver_sql('BEGIN')
 
-    # Will cause the Connection to be bootstrapped and registered upon this demand.
-    connection = session_durable_registry.get(handle)
     populate_database(connection)
 
+    session_durable_registry._register(connection)
+
+    yield connection
+
+    session_durable_registry.close_and_pop(connection.sql_cell_handle)
+
+
+@pytest.fixture
+def populated_sqlite_database(session_populated_sqlite_database: SQLiteConnection) -> None:
+    """Run the test within a transaction against the session's @sqlite database, rolling back
+    any changes (including created or dropped tables and views) afterwards."""
+
+    transaction = session_populated_sqlite_database.sqla_connection.begin()
+
     yield
 
-    cleanup_any_extra_tables(connection)
+    transaction.rollback()
 
 
 # For tests talking to a live cockroachdb
@@ -387,6 +450,12 @@ def bad_port_number_cockroach_connection(
 def session_populated_cockroach_database(
     cockroach_database_connection: Tuple[str, str], session_durable_registry
 ) -> None:
+    """Populate the live CockroachDB once per session.
+
+    Under pytest-xdist, the managed cockroach server is shared by all workers while these fixed
+    table names are not, so every test class using it is marked xdist_group(name="cockroach")
+    and runs on a single worker (with --dist loadgroup).
+    """
     handle, _ = cockroach_database_connection
     connection = session_durable_registry.get(handle)
     populate_database(connection, include_comments=True)
@@ -410,10 +479,10 @@ def populated_cockroach_database(
     cleanup_any_extra_tables(connection)
 
 
-@pytest.fixture
-def tests_fixture_data() -> Path:
-    """Return Path pointing to tests/fixture_data/ dir"""
-    return Path(__file__).parent / 'fixture_data'
+@pytest.fixture(scope='session')
+def mammals_db_bytes() -> bytes:
+    """Return the contents of tests/fixture_data/portal_mammals.sqlite, read just once per session."""
+    return (FIXTURE_DATA / 'portal_mammals.sqlite').read_bytes()
 
 
 @dataclass
@@ -1,5 +1,6 @@
 import pytest
-import sqlalchemy.engine.base
+from sqlalchemy.engine import Connection as SQLAConnection
+from sqlalchemy.engine import Engine as SQLAEngine
 
 from noteable.sql.connection import (
     BaseConnection,
@@ -94,7 +95,7 @@ class TestGetSqlaConnection:
         handle, human_name = sqlite_database_connection
 
         assert get_sqla_connection(handle) == get_sqla_connection(human_name) and isinstance(
-            get_sqla_connection(handle), sqlalchemy.engine.base.Connection
+            get_sqla_connection(handle), SQLAConnection
         )
 
     def test_raises_if_not_found(self):
@@ -109,7 +110,7 @@ class TestGetSqlaEngine:
         handle, human_name = sqlite_database_connection
 
         assert get_sqla_engine(handle) == get_sqla_engine(human_name) and isinstance(
-            get_sqla_engine(handle), sqlalchemy.engine.Engine
+            get_sqla_engine(handle), SQLAEngine
         )
 
     def test_raises_if_not_found(self):
@@ -1,5 +1,6 @@
 """ Tests over the data loading magic, "create_or_replace_data_view" """
 
+import re
 from pathlib import Path
 
 import pytest
@@ -8,6 +9,12 @@ from sqlalchemy import text
 from noteable.data_loader import NoteableDataLoaderMagic
 from noteable.sql.connection import UnknownConnectionError, get_connection_registry, get_sqla_engine
 
+UNKNOWN_CONNECTION_RE = re.compile(
+    re.escape(
+        'Cannot find data connection. If you recently created this connection, please restart the kernel'
+    )
+)
+
 
 @pytest.fixture
 def csv_file(tmp_path: Path) -> Path:
@@ -48,7 +55,7 @@ class TestDataLoaderMagic:
         data_loader.execute(f"{csv_file} my_table2")
 
         # Shoulda populated into @notable duckdb
-        conn = conn = get_connection_registry().get('@noteable')
+        conn = get_connection_registry().get('@noteable')
         sqla_connection = conn.sqla_connection
         with sqla_connection.begin():
             # rowcounts better be equal between the two tables!
@@ -99,10 +106,7 @@ class TestDataLoaderMagic:
 
     @pytest.mark.usefixtures("with_empty_connections")
     def test_cannot_load_into_unknown_handle(self, csv_file, data_loader):
-        with pytest.raises(
-            UnknownConnectionError,
-            match="Cannot find data connection. If you recently created this connection, please restart the kernel",
-        ):
+        with pytest.raises(UnknownConnectionError, match=UNKNOWN_CONNECTION_RE):
             data_loader.execute(f"{csv_file} the_table --connection @nonexistenthandle")
 
         assert len(get_connection_registry()) == 0
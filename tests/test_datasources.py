@@ -2,9 +2,9 @@
 
 import json
 import os
+import re
 from pathlib import Path
 from typing import Callable, List, Tuple, Union
-from unittest.mock import patch
 from uuid import uuid4
 
 import certifi
@@ -12,10 +12,12 @@ import pkg_resources
 import pytest
 import structlog
 from sqlalchemy import text
+from sqlalchemy.sql.elements import TextClause  # Return type from sqlalchemy.text()
 from structlog.testing import LogCapture
 
 from noteable import datasources
 from noteable.logging import configure_logging
+from noteable.sql import sqlalchemy as sqlalchemy_connections
 from noteable.sql.connection import Connection, get_connection_registry, get_sqla_engine
 from noteable.sql.sqlalchemy import (
     AwsAthenaConnection,
@@ -31,6 +33,10 @@ from noteable.sql.sqlalchemy import (
 )
 from tests.conftest import DatasourceJSONs
 
+# Expected exception message patterns, compiled once.
+NOT_INSTALLED_RE = re.compile('requires package .* but is not already installed')
+DATABRICKS_CONNECT_TIMEOUT_RE = re.compile('databricks-connect took longer than')
+
 
 @pytest.fixture
 def log_output() -> LogCapture:
@@ -651,11 +657,11 @@ class TestDatabricks:
     """
 
     @pytest.fixture()
-    def tmp_home(self, tmpdir: Path) -> Path:
+    def tmp_home(self, tmp_path: Path) -> Path:
         """Replace $HOME to be a new directory of $TMPDIR, yielding the new Path."""
         existing_home = os.environ['HOME']
 
-        new_home = tmpdir / 'home'
+        new_home = tmp_path / 'home'
 
         new_home.mkdir()
 
@@ -667,7 +673,7 @@ class TestDatabricks:
             os.environ['HOME'] = existing_home
 
     @pytest.fixture()
-    def databricks_connect_in_path(self, tmpdir: Path) -> Tuple[Path, Path]:
+    def databricks_connect_in_path(self, tmp_path: Path) -> Tuple[Path, Path]:
         """Get a mock-ish executable 'databricks-connect' into an element in the path
         so that which('databricks-connect') will find something (see databricks post
         processor)
@@ -675,10 +681,10 @@ class TestDatabricks:
         Yields the new executable's path, plus where it will scribble its own output.
         """
 
-        # Make a new subdir of tmpdir, add it to the path, create executable
+        # Make a new subdir of tmp_path, add it to the path, create executable
         # shell script databricks-connect
 
-        bindir = tmpdir / 'scratch-bin'
+        bindir = tmp_path / 'scratch-bin'
         bindir.mkdir()
 
         orig_path = os.environ['PATH']
@@ -686,11 +692,10 @@ class TestDatabricks:
         os.environ['PATH'] = f"{orig_path}:{bindir}"
 
         scriptpath = bindir / 'databricks-connect'
-        script_output_path = tmpdir / 'connect-inputs.txt'
+        script_output_path = tmp_path / 'connect-inputs.txt'
 
-        # Now make a 'databricks-connect' executable that echos all its stdin to tmpdir/connect-inputs.txt.txt.
-        with open(scriptpath, 'w') as outfile:
-            outfile.write(f'#!/bin/sh\ncat > {script_output_path}\nexit 0\n')
+        # Now make a 'databricks-connect' executable that echos all its stdin to tmp_path/connect-inputs.txt.
+        scriptpath.write_text(f'#!/bin/sh\ncat > {script_output_path}\nexit 0\n')
 
         scriptpath.chmod(0o755)
 
@@ -782,10 +787,7 @@ class TestDatabricks:
         expected_error_message = 'oh noes!'
 
         # Respell the script to bomb out with message to stderr.
-        with script_path.open('w') as of:
-            of.write('#!/bin/sh\n')
-            of.write(f'echo "{expected_error_message}" 1>&2\n')
-            of.write('exit 1\n')
+        script_path.write_text(f'#!/bin/sh\necho "{expected_error_message}" 1>&2\nexit 1\n')
 
         jsons_obj, specific_fields = jsons_for_extra_behavior
         create_engine_kwargs = {'connect_args': jsons_obj.connect_args_dict}
@@ -822,15 +824,12 @@ class TestDatabricks:
         script_path, _ = databricks_connect_in_path
 
         # Respell the script to take longer than new timeout, but to (try to) exit cleanly
-        with script_path.open('w') as of:
-            of.write('#!/bin/sh\n')
-            of.write(f'sleep {short_script_timeout+1}\n')
-            of.write('exit 0\n')
+        script_path.write_text(f'#!/bin/sh\nsleep {short_script_timeout+1}\nexit 0\n')
 
         jsons_obj, specific_fields = jsons_for_extra_behavior
         create_engine_kwargs = {'connect_args': jsons_obj.connect_args_dict}
 
-        with pytest.raises(ValueError, match='databricks-connect took longer than'):
+        with pytest.raises(ValueError, match=DATABRICKS_CONNECT_TIMEOUT_RE):
             DatabricksConnection.preprocess_configuration(
                 datasource_id,
                 jsons_obj.dsn_dict,
@@ -845,8 +844,7 @@ class TestDatabricks:
         # Make a preexisting tmp_home/.databricks-connect, expect it to get unlinked
         # (see lines in postprocess_databricks)
         dotconnect = tmp_home / '.databricks-connect'
-        with dotconnect.open('w') as of:
-            of.write('exists')
+        dotconnect.write_text('exists')
 
         assert dotconnect.exists()
 
@@ -879,7 +877,7 @@ class TestDatabricks:
         # Expect to find things in it. See ENG-5517.
         # We can only test that we ran this mock script and the known result
         # of our mock script. What the real one does ... ?
-        contents = script_output.read().split('\n')
+        contents = script_output.read_text().split('\n')
         assert len(contents) == 6
         assert contents[0] == 'y'
         assert contents[1] == f"https://{case_dict['hostname']}/"
@@ -896,8 +894,7 @@ class TestDatabricks:
         # script in our path.
 
         dotconnect = tmp_home / '.databricks-connect'
-        with dotconnect.open('w') as of:
-            of.write('preexists')
+        dotconnect.write_text('preexists')
 
         assert dotconnect.exists()
 
@@ -919,7 +916,7 @@ class TestDatabricks:
 
         # Left unchanged
         assert dotconnect.exists()
-        assert 'preexists' in dotconnect.read()
+        assert 'preexists' in dotconnect.read_text()
 
     def test_skip_extra_behavior_if_no_cluster_id(
         self, datasource_id, tmp_home, databricks_connect_in_path
@@ -929,8 +926,7 @@ class TestDatabricks:
         # script in our path.
 
         dotconnect = tmp_home / '.databricks-connect'
-        with dotconnect.open('w') as of:
-            of.write('preexists')
+        dotconnect.write_text('preexists')
 
         assert dotconnect.exists()
 
@@ -956,9 +952,11 @@ class TestDatabricks:
         # But won't have breathed on dotconnect file.
         # Left unchanged
         assert dotconnect.exists()
-        assert 'preexists' in dotconnect.read()
+        assert 'preexists' in dotconnect.read_text()
 
 
+# Mutates the shared virtualenv, so keep on a single xdist worker.
+@pytest.mark.xdist_group(name="pip_state")
 class TestEnsureRequirements:
     def test_already_installed(self, datasource_id):
         requirements = ['pip']
@@ -975,10 +973,12 @@ class TestEnsureRequirements:
     def test_raises_when_disallowed_but_needs_to_install(
         self, datasource_id, not_installed_packages
     ):
-        with pytest.raises(Exception, match='requires package .* but is not already installed'):
+        with pytest.raises(Exception, match=NOT_INSTALLED_RE):
             datasources.ensure_requirements(datasource_id, not_installed_packages, False)
 
 
+# Mutates the shared virtualenv, so keep on a single xdist worker.
+@pytest.mark.xdist_group(name="pip_state")
 class TestInstallPackage:
     def test_install(self, not_installed_package):
         pkgname = not_installed_package
@@ -1005,8 +1005,6 @@ class TestRedshiftConnection:
     def test_get_view_definition_returns_str_when_given_text_obj(self, mocker):
         """Ensure that Redshift's Inspector implementation returns strings from get_view_definition()"""
 
-        from sqlalchemy.sql.elements import TextClause  # Return type from sqlalchemy.text()
-
         # Setup mock underlying inspector that will return a text() object from get_view_definition
         mocked_inspector_from_redshift = mocker.Mock(WrappedInspector)
         mocked_inspector_from_redshift.get_view_definition = mocker.Mock()
@@ -1035,6 +1033,26 @@ class TestRedshiftConnection:
         assert isinstance(defn, str) and defn == ''
 
 
+class CannedResponse:
+    """Just enough of requests.Response for SQLiteConnection.preprocess_configuration()"""
+
+    def __init__(self, content: bytes):
+        self.content = content
+
+    def __enter__(self) -> 'CannedResponse':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def iter_content(self, chunk_size: int):
+        for offset in range(0, len(self.content), chunk_size):
+            yield self.content[offset : offset + chunk_size]
+
+
 class TestSQLite:
     @pytest.mark.parametrize(
         'sample',
@@ -1057,7 +1075,7 @@ class TestSQLite:
         ),
     )
     def test_preprocess_sqlite_pops_max_download_seconds_correctly(
-        self, sample: Union[str, DatasourceJSONs], datasource_id, requests_mock, tests_fixture_data
+        self, sample: Union[str, DatasourceJSONs], datasource_id, monkeypatch, mammals_db_bytes
     ):
         if isinstance(sample, str):
             jsons = SampleData.get_sample(sample)
@@ -1068,14 +1086,15 @@ class TestSQLite:
 
         assert 'max_download_seconds' in create_engine_kwargs['connect_args']
 
-        with open(tests_fixture_data / 'portal_mammals.sqlite', 'rb') as response_file:
-            if jsons.dsn_dict['database'].startswith('mock'):
-                # Set up response for a GET to that URL to return the contents of our canned copy.
-                requests_mock.get(jsons.dsn_dict['database'], body=response_file)
+        if jsons.dsn_dict['database'].startswith('mock'):
+            # Have a GET to that URL return the contents of our canned copy. Only the one URL
+            # is fetched, so no need for the whole requests_mock adapter machinery.
+            canned = CannedResponse(mammals_db_bytes)
+            monkeypatch.setattr(sqlalchemy_connections.requests, 'get', lambda url, **kw: canned)
 
-            SQLiteConnection.preprocess_configuration(
-                datasource_id, dsn_dict=jsons.dsn_dict, create_engine_kwargs=create_engine_kwargs
-            )
+        SQLiteConnection.preprocess_configuration(
+            datasource_id, dsn_dict=jsons.dsn_dict, create_engine_kwargs=create_engine_kwargs
+        )
 
         # Should be popped out from connect_args regardless of if was mem db or real download db.
         assert 'max_download_seconds' not in create_engine_kwargs['connect_args']
@@ -1155,6 +1174,11 @@ class TestSQLite:
             },
             {'foo': 'bar', 'blammo': {'blat': 'blarg'}},
         ),
+        (
+            # Flat, nothing blank: should be left alone.
+            {'host': 'sdfsfetr.us-east-1', 'port': 5432},
+            {'host': 'sdfsfetr.us-east-1', 'port': 5432},
+        ),
     ],
 )
 def test_pre_process_dict(test_dict, expected):
@@ -1232,11 +1256,12 @@ def test_postprocess_awsathena(input_dicts, expected_dicts):
         ),
     ],
 )
-def test_postprocess_clickhouse(input_create_engine_dict, expected_query_params):
-    with patch.object(certifi, 'where', return_value='/path/to/certifi/cert.pem'):
-        dsn_dict = {}
-        ClickhouseConnection.preprocess_configuration(None, dsn_dict, input_create_engine_dict)
-        assert dsn_dict['query'] == expected_query_params
+def test_postprocess_clickhouse(input_create_engine_dict, expected_query_params, monkeypatch):
+    monkeypatch.setattr(certifi, 'where', lambda: '/path/to/certifi/cert.pem')
+
+    dsn_dict = {}
+    ClickhouseConnection.preprocess_configuration(None, dsn_dict, input_create_engine_dict)
+    assert dsn_dict['query'] == expected_query_params
 
 
 def test_postprocess_clickhouse_raises_on_bad_secure_connection():
@@ -1,6 +1,6 @@
 import pytest
-import sqlalchemy.engine
-import sqlalchemy.engine.base
+from sqlalchemy.engine import Connection as SQLAConnection
+from sqlalchemy.engine import Engine as SQLAEngine
 
 # These functions are consciously exposed for use within Notebooks.
 from noteable.sql import get_sqla_connection, get_sqla_engine
@@ -10,8 +10,8 @@ class TestToplevelExposedConvenienceGetters:
     @pytest.mark.parametrize(
         'convenence_function,expected_class',
         [
-            (get_sqla_connection, sqlalchemy.engine.base.Connection),
-            (get_sqla_engine, sqlalchemy.engine.Engine),
+            (get_sqla_connection, SQLAConnection),
+            (get_sqla_engine, SQLAEngine),
         ],
     )
     def test_get_sqla_connection(
@@ -1,9 +1,9 @@
 """ Tests over the data loading magic, "create_or_replace_data_view" """
 
+import itertools
 import os
 from pathlib import Path
 from unittest.mock import Mock
-from uuid import uuid4
 
 import pandas as pd
 import pytest
@@ -13,6 +13,13 @@ from sqlalchemy.exc import OperationalError
 
 from noteable import datasources
 from noteable.sql.connection import get_connection_registry
+from noteable.sql.parse import parse
+from noteable.sql.run import (
+    _MAX_CACHED_STATEMENT_LENGTH,
+    _cached_template_for,
+    _template_for,
+    jinja_sql,
+)
 from noteable.sql.sqlalchemy import SQLAlchemyResult
 from tests.conftest import COCKROACH_HANDLE, DatasourceJSONs
 
@@ -20,16 +27,26 @@ from tests.conftest import COCKROACH_HANDLE, DatasourceJSONs
 @pytest.mark.usefixtures("populated_sqlite_database")
 class TestSqlMagic:
     @pytest.mark.parametrize(
-        'invocation',
+        'line_invocation,cell_invocation',
         [
-            '@sqlite select a, b from int_table',  # as from line magic invocation
-            '@sqlite\nselect a, b\nfrom int_table',  # as from cell magic / Planar Ally
+            ('@sqlite select a, b from int_table', '@sqlite\nselect a, b\nfrom int_table'),
+            ('@sqlite #scalar select 1 + 2', '@sqlite\n#scalar select 1 + 2'),
+            ('@sqlite #scalar select 1 as a, 2 as b', '@sqlite\n#scalar select 1 as a, 2 as b'),
+            ('@sqlite the_sum << #scalar select 1 + 2', '@sqlite the_sum <<\n#scalar select 1 + 2'),
         ],
+        ids=['select', 'scalar', 'scalar_multi_column', 'scalar_assignment'],
     )
-    def test_basic_query(self, invocation, sql_magic, ipython_shell):
+    def test_invocation_separator_parsing(self, line_invocation, cell_invocation, sql_magic):
+        """Line magic invocations (connection and query on one line) and cell magic / Planar Ally
+        invocations (query on following lines) should parse identically, so the end-to-end
+        tests below need only exercise one spelling."""
+
+        assert parse(line_invocation, sql_magic) == parse(cell_invocation, sql_magic)
+
+    def test_basic_query(self, sql_magic, ipython_shell):
         """Test basic query behavior"""
 
-        results = sql_magic.execute(invocation)
+        results = sql_magic.execute('@sqlite\nselect a, b\nfrom int_table')
         assert isinstance(results, pd.DataFrame)
 
         # Two rows as from populated_sqlite_database
@@ -37,35 +54,21 @@ class TestSqlMagic:
         assert results['a'].tolist() == [1, 4]
         assert results['b'].tolist() == [2, 5]
 
-    @pytest.mark.parametrize(
-        'invocation',
-        [
-            '@sqlite #scalar select 1 + 2',  # as from line magic invocation
-            '@sqlite\n#scalar select 1 + 2',  # as from cell magic / Planar Ally
-        ],
-    )
     def test_returning_scalar_when_requested_and_single_value_resultset(
-        self, invocation, sql_magic, ipython_shell
+        self, sql_magic, ipython_shell
     ):
         """Should return bare scalar when result set was single row/column and asked"""
-        results = sql_magic.execute(invocation)
+        results = sql_magic.execute('@sqlite\n#scalar select 1 + 2')
         assert isinstance(results, int)
         assert results == 3
 
-    @pytest.mark.parametrize(
-        'invocation',
-        [
-            '@sqlite #scalar select 1 as a, 2 as b',  # as from line magic invocation
-            '@sqlite\n#scalar select 1 as a, 2 as b',  # as from cell magic / Planar Ally
-        ],
-    )
     def test_dataframe_returned_if_nonscalar_result_despite_asking_for_scalar(
-        self, invocation, sql_magic, ipython_shell
+        self, sql_magic, ipython_shell
     ):
         """Despite asking for scalar, if result is dataframe that's what you get"""
 
         # Multiple columns.
-        results = sql_magic.execute(invocation)
+        results = sql_magic.execute('@sqlite\n#scalar select 1 as a, 2 as b')
         assert isinstance(results, pd.DataFrame)
         assert len(results) == 1
 
@@ -76,6 +79,35 @@ class TestSqlMagic:
         results = sql_magic.execute('@sqlite #scalar select a from int_table')
         assert isinstance(results, pd.DataFrame)
 
+    def test_template_cache_reuse(self, sql_magic, ipython_shell):
+        """Rerunning the same cell should reuse the already-parsed jinja template"""
+        ipython_shell.user_ns['a_value'] = 1
+
+        sql_magic.execute('@sqlite\n#scalar select b from int_table where a = {{a_value}}')
+        hits_before = _cached_template_for.cache_info().hits
+
+        ipython_shell.user_ns['a_value'] = 4
+        results = sql_magic.execute(
+            '@sqlite\n#scalar select b from int_table where a = {{a_value}}'
+        )
+
+        assert _cached_template_for.cache_info().hits == hits_before + 1
+        # ... but still rendered against the current namespace.
+        assert results == 5
+
+    def test_long_statements_bypass_template_cache(self):
+        statement = 'select {{a_value}} -- ' + 'x' * _MAX_CACHED_STATEMENT_LENGTH
+        info_before = _cached_template_for.cache_info()
+
+        for a_value in (1, 2):
+            query, bind_list = jinja_sql.prepare_query(
+                _template_for(statement), {'a_value': a_value}
+            )
+            assert query.startswith('select :1 -- ')
+            assert bind_list == [a_value]
+
+        assert _cached_template_for.cache_info() == info_before
+
     def test_select_no_rows_from_table_produces_zero_row_dataframe_with_expected_columns(
         self, sql_magic
     ):
@@ -86,18 +118,11 @@ class TestSqlMagic:
         assert len(results) == 0
         assert results.columns.tolist() == ['a', 'b', 'c']
 
-    @pytest.mark.parametrize(
-        'invocation',
-        [
-            '@sqlite the_sum << #scalar select 1 + 2',  # as from line magic invocation
-            '@sqlite the_sum <<\n#scalar select 1 + 2',  # as from cell magic / Planar Ally
-        ],
-    )
     def test_returning_scalar_when_requested_and_single_value_resultset_assigns_variable(
-        self, invocation, sql_magic, ipython_shell
+        self, sql_magic, ipython_shell
     ):
         """Should return + assign bare scalar when result set was single row/column and asked"""
-        results = sql_magic.execute(invocation)
+        results = sql_magic.execute('@sqlite the_sum <<\n#scalar select 1 + 2')
         assert isinstance(results, int)
         assert results == 3
 
@@ -151,11 +176,49 @@ class TestSqlMagic:
         assert len(session_durable_registry) == initial_connection_count
 
 
-@pytest.mark.usefixtures("populated_cockroach_database", "populated_sqlite_database")
+# Scratch table names need only be unique within the session; created tables are dropped
+# (cockroach) or rolled back (sqlite) after each test anyway.
+_table_counter = itertools.count()
+
+
+@pytest.mark.xdist_group(name="cockroach")
 class TestDDLStatements:
-    @pytest.mark.parametrize('conn_name', ['@sqlite', COCKROACH_HANDLE])
-    def test_ddl_lifecycle(self, conn_name: str, sql_magic):
-        table_name = f'test_table_{uuid4().hex}'
+    @pytest.fixture
+    def conn_name(self, request) -> str:
+        """Indirectly parametrized connection handle. Only sets up the database behind it,
+        so that, say, `-k sqlite` runs need no cockroach."""
+        handle = request.param
+
+        if handle == COCKROACH_HANDLE:
+            request.getfixturevalue('populated_cockroach_database')
+        else:
+            request.getfixturevalue('populated_sqlite_database')
+
+        return handle
+
+    @pytest.mark.parametrize(
+        'conn_name', ['@sqlite', COCKROACH_HANDLE], ids=['sqlite', 'cockroach'], indirect=True
+    )
+    def test_ddl_lifecycle_smoke(self, conn_name: str, sql_magic):
+        """Whole lifecycle as a single multi-statement cell. Only the final statement's
+        result comes back."""
+        table_name = f'test_table_{next(_table_counter)}'
+
+        r = sql_magic.execute(
+            f"""{conn_name}
+            create table {table_name}(id int not null primary key, name text not null);
+            insert into {table_name} (id, name) values (1, 'billy'), (2, 'bob');
+            delete from {table_name} where name = 'billy'
+            """
+        )
+
+        # Just the one row affected by the delete.
+        assert r == 1
+
+    @pytest.mark.parametrize('conn_name', ['@sqlite'], ids=['sqlite'], indirect=True)
+    def test_ddl_lifecycle_assertions(self, conn_name: str, sql_magic):
+        """Step by step, asserting on each statement's result."""
+        table_name = f'test_table_{next(_table_counter)}'
 
         r = sql_magic.execute(
             f'{conn_name}\ncreate table {table_name}(id int not null primary key, name text not null)'
@@ -174,9 +237,9 @@ class TestDDLStatements:
         # Just one row affected here, and printed to stdout
         assert r == 1
 
-    @pytest.mark.parametrize('conn_name', [COCKROACH_HANDLE])
+    @pytest.mark.parametrize('conn_name', [COCKROACH_HANDLE], ids=['cockroach'], indirect=True)
     def test_insert_returning_returns_dataframe(self, conn_name: str, sql_magic):
-        table_name = f'test_table_{uuid4().hex}'
+        table_name = f'test_table_{next(_table_counter)}'
 
         sql_magic.execute(
             f'{conn_name}\ncreate table {table_name}(id serial not null primary key, name text not null)'
@@ -188,10 +251,12 @@ class TestDDLStatements:
 
         assert isinstance(r, pd.DataFrame)
         assert r.columns.tolist() == ['id']
-        assert all(isinstance(idval, int) for idval in r['id'].tolist())
+        assert len(r) == 2
+        assert pd.api.types.is_integer_dtype(r['id'])
 
 
 @pytest.mark.usefixtures("populated_cockroach_database")
+@pytest.mark.xdist_group(name="cockroach")
 class TestJinjaTemplatesWithinSqlMagic:
     """Tests over jinjasql integration. See https://github.com/sripathikrishnan/jinjasql"""
 
@@ -322,7 +387,7 @@ class TestJinjaTemplatesWithinSqlMagic:
 class TestSQLite:
     """Integration test cases of bootstrapping through to using SQLite datasource type datasource"""
 
-    @pytest.mark.parametrize('memory_spelling', ('', ':memory:'))
+    @pytest.mark.parametrize('memory_spelling', ('', ':memory:'), ids=['empty', 'memory'])
     def test_success_against_memory_only_database(
         self, sql_magic, datasource_id, memory_spelling, tmp_path
     ):
@@ -337,7 +402,7 @@ class TestSQLite:
     def test_success_simulated_loading_database_from_figshare(
         self,
         sql_magic,
-        tests_fixture_data: Path,
+        mammals_db_bytes: bytes,
         datasource_id: str,
         requests_mock,
         log_capture,
@@ -349,23 +414,20 @@ class TestSQLite:
         # We gots the canned file from that URL in `tests/fixture_data/portal_mammals.sqlite`.
 
         mammals_url = 'mock://mammals_database/'
-        with open(tests_fixture_data / 'portal_mammals.sqlite', 'rb') as response_file:
-            # Set up response for a GET to that URL to return the contents of our canned copy.
-            requests_mock.get(mammals_url, body=response_file)
+        # Set up response for a GET to that URL to return the contents of our canned copy.
+        requests_mock.get(mammals_url, content=mammals_db_bytes)
 
-            # Bootstrap the datasource to 'download' this data file.
+        # Bootstrap the datasource to 'download' this data file.
 
-            self.queue_bootstrapping(tmp_path, datasource_id, mammals_url)
+        self.queue_bootstrapping(tmp_path, datasource_id, mammals_url)
 
-            with log_capture() as logs:
-                results = sql_magic.execute(
-                    f'@{datasource_id} #scalar select count(*) from species'
-                )
+        with log_capture() as logs:
+            results = sql_magic.execute(f'@{datasource_id} #scalar select count(*) from species')
 
-                # The bootstrapping is delayed until first use.
-                assert logs[0]['event'] == 'Downloading sqlite database initial contents'
-                assert logs[0]['database_url'] == mammals_url
-                assert logs[0]['max_download_seconds'] == 10  # The default when unspecified.
+            # The bootstrapping is delayed until first use.
+            assert logs[0]['event'] == 'Downloading sqlite database initial contents'
+            assert logs[0]['database_url'] == mammals_url
+            assert logs[0]['max_download_seconds'] == 10  # The default when unspecified.
 
         # There oughta be rows in that species table!
         assert results == 54
@@ -373,7 +435,7 @@ class TestSQLite:
     def test_success_simulated_loading_database_from_figshare_nondefault_max_timeout(
         self,
         sql_magic,
-        tests_fixture_data: Path,
+        mammals_db_bytes: bytes,
         datasource_id: str,
         requests_mock,
         tmp_path,
@@ -382,26 +444,23 @@ class TestSQLite:
         """Test 'downloading' the database with nondefault max timeout."""
 
         mammals_url = 'mock://mammals_database/'
-        with open(tests_fixture_data / 'portal_mammals.sqlite', 'rb') as response_file:
-            # Set up response for a GET to that URL to return the contents of our canned copy.
-            requests_mock.get(mammals_url, body=response_file)
+        # Set up response for a GET to that URL to return the contents of our canned copy.
+        requests_mock.get(mammals_url, content=mammals_db_bytes)
 
-            # Prep to bootstrap the datasource to 'download' this data file.
-            self.queue_bootstrapping(tmp_path, datasource_id, mammals_url, max_download_seconds=22)
+        # Prep to bootstrap the datasource to 'download' this data file.
+        self.queue_bootstrapping(tmp_path, datasource_id, mammals_url, max_download_seconds=22)
 
-            with log_capture() as logs:
-                # It should get auto-bootstrapped on demand!
-                results = sql_magic.execute(
-                    f'@{datasource_id} #scalar select count(*) from species'
-                )
+        with log_capture() as logs:
+            # It should get auto-bootstrapped on demand!
+            results = sql_magic.execute(f'@{datasource_id} #scalar select count(*) from species')
 
-                # There oughta be rows in that species table!
-                assert results == 54
+            # There oughta be rows in that species table!
+            assert results == 54
 
-            # Bootstrapping / downloading shoulda left a log trail....
-            assert logs[0]['event'] == 'Downloading sqlite database initial contents'
-            assert logs[0]['database_url'] == mammals_url
-            assert logs[0]['max_download_seconds'] == 22  # Explicitly specified.
+        # Bootstrapping / downloading shoulda left a log trail....
+        assert logs[0]['event'] == 'Downloading sqlite database initial contents'
+        assert logs[0]['database_url'] == mammals_url
+        assert logs[0]['max_download_seconds'] == 22  # Explicitly specified.
 
     # Works great, but not for CICD use.
     '''
@@ -419,9 +478,16 @@ class TestSQLite:
         assert results == 54
     '''
 
-    @pytest.mark.parametrize(
-        'exc,expected_substring',
-        [
+    def test_failing_download(self, sql_magic, datasource_id, requests_mock, tmp_path):
+        failing_url = 'mock://failed.download/'
+
+        # Queue up to delay bootstrapping for this datasource
+        # bootstapping errors are no longer deferred.
+        self.queue_bootstrapping(tmp_path, datasource_id, failing_url)
+
+        # A failed bootstrap leaves the bootstrapper queued, so each cell run retries the
+        # download and sees whatever the next exception is.
+        for exc, expected_substring in [
             (requests.exceptions.Timeout("Read timed out."), 'Read timed out'),
             (requests.exceptions.ConnectTimeout('Connect timed out.'), 'Connect timed out'),
             (
@@ -430,29 +496,18 @@ class TestSQLite:
                 ),
                 '404 Client Error',
             ),
-        ],
-    )
-    def test_failing_download(
-        self, sql_magic, datasource_id, requests_mock, exc, expected_substring, tmp_path
-    ):
-        failing_url = 'mock://failed.download/'
+        ]:
+            # Set up to simulate exception coming up while making requests.get() call to try to
+            # download the seed database. Replaces any prior registration for this url.
+            requests_mock.get(failing_url, exc=exc)
 
-        # Set up to simulate exception coming up while making requests.get() call to try to
-        # download the seed database.
-        requests_mock.get(
-            failing_url,
-            exc=exc,
-        )
-
-        # Queue up to delay bootstrapping for this datasource
-        # bootstapping errors are no longer deferred.
-        self.queue_bootstrapping(tmp_path, datasource_id, failing_url)
-
-        # Will bootstrap upon demand, but will fail and raise the underlying issue immediately.
-        with pytest.raises(type(exc), match=expected_substring):
-            sql_magic.execute(f'@{datasource_id} #scalar select count(*) from species')
+            # Will bootstrap upon demand, but will fail and raise the underlying issue immediately.
+            with pytest.raises(type(exc), match=expected_substring):
+                sql_magic.execute(f'@{datasource_id} #scalar select count(*) from species')
 
-    @pytest.mark.parametrize('bad_path', ['/usr/bin/bash', 'relative_project_file.sqlite'])
+    @pytest.mark.parametrize(
+        'bad_path', ['/usr/bin/bash', 'relative_project_file.sqlite'], ids=['not_tmp', 'relative']
+    )
     def test_fail_bad_pathname(self, sql_magic, datasource_id, bad_path, tmp_path):
         """Test providing local database pathname, but in disallowed place."""
 
@@ -646,6 +701,7 @@ class TestResultSet:
                 },
             ),
         ],
+        ids=['no_keys', 'empty_dataframe', 'dataframe', 'rowcount', 'scalar'],
     )
     def test_create_result_set(self, sqla_result_mock_attrs, expected_result_set_attrs):
         sqla_result_mock = Mock(**sqla_result_mock_attrs)
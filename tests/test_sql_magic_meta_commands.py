@@ -27,8 +27,16 @@ from noteable.sql.sqlalchemy.utils import (
 from noteable.sql.types import RelationStructureDescription
 from tests.conftest import COCKROACH_HANDLE, COCKROACH_UUID, KNOWN_TABLES, KNOWN_TABLES_AND_KINDS
 
+# Expected str_int_view definition within \describe's HTML, compiled once. Some dialects include
+# a 'CREATE VIEW' statement, others just start with 'select\n', and will vary by case.
+VIEW_DEFINITION_RE = re.compile(
+    '.*<pre>.*select.*s.str_id, s.int_col.*</pre>$',
+    re.IGNORECASE | re.MULTILINE | re.DOTALL,
+)
+
 
 @pytest.mark.usefixtures("populated_sqlite_database", "populated_cockroach_database")
+@pytest.mark.xdist_group(name="cockroach")
 class TestListSchemas:
     @pytest.mark.parametrize(
         'connection_handle,expected_results',
@@ -112,6 +120,7 @@ class TestListSchemas:
 
 
 @pytest.mark.usefixtures("populated_sqlite_database", "populated_cockroach_database")
+@pytest.mark.xdist_group(name="cockroach")
 class TestRelationsCommand:
     @pytest.mark.parametrize(
         'connection_handle',
@@ -213,6 +222,7 @@ class TestRelationsCommand:
 
 
 @pytest.mark.usefixtures("populated_cockroach_database")
+@pytest.mark.xdist_group(name="cockroach")
 class TestTablesCommand:
     def test_list_tables(
         self,
@@ -249,13 +259,13 @@ class TestTablesCommand:
         for invocation_and_maybe_arg in [r'\tables *', r'\tables', r'\dt']:
             sql_magic.execute(f'{COCKROACH_HANDLE} {invocation_and_maybe_arg}')
             results = ipython_namespace['_']
-
-        assert len(results) == 3
-        assert set(results['Schema'].tolist()) == set(('public',))
-        assert results['Table'].tolist() == ['int_table', 'references_int_table', 'str_table']
+            assert len(results) == 3
+            assert set(results['Schema'].tolist()) == set(('public',))
+            assert results['Table'].tolist() == ['int_table', 'references_int_table', 'str_table']
 
 
 @pytest.mark.usefixtures("populated_cockroach_database")
+@pytest.mark.xdist_group(name="cockroach")
 class TestViewsCommand:
     def test_list_views(self, sql_magic, ipython_namespace):
         # Show only views (no tables) in all schemas.
@@ -285,6 +295,7 @@ class TestViewsCommand:
 
 
 @pytest.mark.usefixtures("populated_sqlite_database", "populated_cockroach_database")
+@pytest.mark.xdist_group(name="cockroach")
 class TestSingleRelationCommand:
     @pytest.mark.parametrize(
         'handle,defaults_might_include_int8,expected_pk_index_name',
@@ -386,12 +397,7 @@ class TestSingleRelationCommand:
         assert isinstance(html_obj, HTML)
         html_contents: str = html_obj.data
         assert html_contents.startswith('<br />\n<h2>View Definition</h2>')
-        # Some dialects include a 'CREATE VIEW' statement, others just start with 'select\n', and will vary by case.
-        matcher = re.compile(
-            '.*<pre>.*select.*s.str_id, s.int_col.*</pre>$',
-            re.IGNORECASE + re.MULTILINE + re.DOTALL,
-        )
-        assert matcher.search(html_contents)
+        assert VIEW_DEFINITION_RE.search(html_contents)
 
     def test_against_uuid_column(self, sql_magic, ipython_namespace):
         """Test that we can introspect into a table that has a UUID column.
@@ -461,20 +467,19 @@ class TestSingleRelationCommand:
         assert fk_df['Referenced Table'].tolist() == [qualified_int_table]
         assert fk_df['Referenced Columns'].tolist() == ['a']
 
-        # Also test against a table with a compound foreign key. Must create table pair ad hoc. Will be cleaned
-        # up upon test cleanup.
+    @pytest.mark.parametrize('handle', [COCKROACH_HANDLE, '@sqlite'], ids=['cockroach', 'sqlite'])
+    def test_compound_foreign_key(self, sql_magic, mock_display, handle):
+        """Describing a table with a compound foreign key should list all of its columns. Schema
+        qualification is already covered by test_foreign_keys, so needs only one variant per handle."""
 
-        sql_magic.execute(
-            f'{handle}\ncreate table {qualified_int_table}_2 (a int, b int, primary key(a, b))'
-        )
+        # Must create table pair ad hoc. Will be cleaned up upon test cleanup.
+        sql_magic.execute(f'{handle}\ncreate table int_table_2 (a int, b int, primary key(a, b))')
 
         sql_magic.execute(
-            f'{handle}\ncreate table {qualified_references_int_table}_2 (a_ref int primary key, b_ref int, constraint a_b_fk foreign key (a_ref, b_ref) references {qualified_int_table}_2(a, b))'
+            f'{handle}\ncreate table references_int_table_2 (a_ref int primary key, b_ref int, constraint a_b_fk foreign key (a_ref, b_ref) references int_table_2(a, b))'
         )
 
-        mock_display.reset_mock()
-
-        sql_magic.execute(fr'{handle} \describe {qualified_references_int_table}_2')
+        sql_magic.execute(fr'{handle} \describe references_int_table_2')
 
         assert (
             len(mock_display.call_args_list) == 3
@@ -561,28 +566,30 @@ class TestSingleRelationCommand:
             'str_table',
         ]
 
-    def test_hate_more_than_one_arg(self, sql_magic):
-        with pytest.raises(MetaCommandException) as excinfo:
-            sql_magic.execute(r'@sqlite \d foo bar')
-            assert str(excinfo).startswith(r'Usage: \d [[schema].[relation_name]]')
-
-    def test_nonexistent_table(self, sql_magic):
-        with pytest.raises(MetaCommandException) as excinfo:
-            sql_magic.execute(rf'{COCKROACH_HANDLE} \d foobar')
-            assert str(excinfo).startswith(r'Relation foobar does not exist')
-
-    def test_nonexistent_schema_qualified_table(self, sql_magic):
+    @pytest.mark.parametrize(
+        'handle,argument,expected_message',
+        [
+            ('@sqlite', 'foo bar', r'Usage: \d [[schema].[relation_name]]'),
+            (COCKROACH_HANDLE, 'foobar', 'Relation foobar does not exist'),
+            (COCKROACH_HANDLE, 'public.foobar', 'Relation public.foobar does not exist'),
+            (COCKROACH_HANDLE, 'sdfsdfsdf.foobar', 'Relation sdfsdfsdf.foobar does not exist'),
+        ],
+        ids=[
+            'more_than_one_arg',
+            'nonexistent_table',
+            'nonexistent_qualified_table',
+            'nonexistent_schema',
+        ],
+    )
+    def test_error_paths(self, sql_magic, handle, argument, expected_message):
         with pytest.raises(MetaCommandException) as excinfo:
-            sql_magic.execute(rf'{COCKROACH_HANDLE} \d public.foobar')
-            assert str(excinfo).startswith(r'Relation public.foobar does not exist')
+            sql_magic.execute(rf'{handle} \d {argument}')
 
-    def test_nonexistent_schema(self, sql_magic):
-        with pytest.raises(MetaCommandException) as excinfo:
-            sql_magic.execute(rf'{COCKROACH_HANDLE} \d sdfsdfsdf.foobar')
-            assert str(excinfo).startswith(r'Relation sdfsdfsdf.foobar does not exist')
+        assert str(excinfo.value).startswith(expected_message)
 
 
 @pytest.mark.usefixtures("populated_cockroach_database")
+@pytest.mark.xdist_group(name="cockroach")
 class TestFullIntrospection:
     @pytest.fixture()
     def patched_relation_structure_messager(self, tmp_path):
@@ -1032,6 +1039,14 @@ def test_convert_relation_glob_to_regex(
     assert convert_relation_glob_to_regex(inp, imply_prefix=imply_prefix) == expected_result
 
 
+def test_convert_relation_glob_to_regex_reuses_compiled_pattern():
+    first = convert_relation_glob_to_regex('int*', imply_prefix=True)
+    hits_before = convert_relation_glob_to_regex.cache_info().hits
+
+    assert convert_relation_glob_to_regex('int*', imply_prefix=True) is first
+    assert convert_relation_glob_to_regex.cache_info().hits == hits_before + 1
+
+
 class TestHandleNotImplemented:
     def test_returns_underlying_when_implemented(self):
         @handle_not_implemented(default='no')